@@ -1 +1,8 @@
 from .core import *
+from .tape import *
+from .function import *
+
+try:
+    from .batched import *
+except ImportError:
+    pass
@@ -0,0 +1,82 @@
+"""Numba-compiled backward kernel over the serialized graph.
+
+Same sweep as `_core.pyx`, but jit-compiled at import time instead of
+requiring a build step. `backward_kernel` is None when numpy or numba
+is missing; `core` then falls back to the per-node Python sweep.
+"""
+try:
+    import numpy as np
+    from numba import njit
+except ImportError:
+    backward_kernel = None
+else:
+    from math import log, sin, cos
+
+    from ._ops import (
+        OP_ADD, OP_SUB, OP_MUL, OP_POW, OP_DIV, OP_SIN, OP_COS,
+        OP_NEG, OP_RDIV, OP_POW_CONST
+    )
+
+    @njit(cache=True)
+    def _sweep(opcodes, lefts, rights, values, grads):
+        for k in range(opcodes.shape[0] - 1, -1, -1):
+            op = opcodes[k]
+            if op < 0:
+                continue
+
+            grad = grads[k]
+            left = lefts[k]
+            right = rights[k]
+
+            if op == OP_ADD:
+                grads[left] += grad
+                grads[right] += grad
+            elif op == OP_SUB:
+                grads[left] += grad
+                grads[right] -= grad
+            elif op == OP_MUL:
+                grads[left] += values[right] * grad
+                grads[right] += values[left] * grad
+            elif op == OP_POW:
+                left_val = values[left]
+                right_val = values[right]
+                if left_val != 0:
+                    grads[left] += right_val * values[k] / left_val * grad
+                else:
+                    grads[left] += \
+                        right_val * left_val ** (right_val - 1) * grad
+                if left_val > 0:
+                    grads[right] += values[k] * log(left_val) * grad
+                else:
+                    grads[right] += np.nan * grad
+            elif op == OP_DIV:
+                right_val = values[right]
+                grads[left] += grad / right_val
+                grads[right] -= values[k] / right_val * grad
+            elif op == OP_SIN:
+                grads[left] += cos(values[left]) * grad
+            elif op == OP_COS:
+                grads[left] -= sin(values[left]) * grad
+            elif op == OP_NEG:
+                grads[left] -= grad
+            elif op == OP_RDIV:
+                grads[left] -= values[k] / values[left] * grad
+            elif op == OP_POW_CONST:
+                left_val = values[left]
+                right_val = values[right]
+                if left_val != 0:
+                    grads[left] += right_val * values[k] / left_val * grad
+                else:
+                    grads[left] += \
+                        right_val * left_val ** (right_val - 1) * grad
+
+    def backward_kernel(opcodes, lefts, rights, values, grads):
+        # Zero-copy views over the array.array buffers from _serialize;
+        # writes through the grads view land in the caller's array.
+        _sweep(
+            np.frombuffer(opcodes, dtype=np.int8),
+            np.frombuffer(lefts, dtype=np.intc),
+            np.frombuffer(rights, dtype=np.intc),
+            np.frombuffer(values, dtype=np.float64),
+            np.frombuffer(grads, dtype=np.float64)
+        )
@@ -0,0 +1,15 @@
+"""Opcode numbering shared by the tape, the serializer in `core` and
+the optional compiled backward kernels. Keep `_core.pyx` in sync when
+adding entries."""
+
+OP_LEAF = -1
+OP_ADD = 0
+OP_SUB = 1
+OP_MUL = 2
+OP_POW = 3
+OP_DIV = 4
+OP_SIN = 5
+OP_COS = 6
+OP_NEG = 7
+OP_RDIV = 8
+OP_POW_CONST = 9
@@ -0,0 +1,234 @@
+from __future__ import annotations
+from typing import Optional, Union, Callable
+
+import numpy as np
+
+
+__all__ = ['BatchedVariable']
+
+Num = Union[int, float]
+BatchedVar = Union['BatchedVariable', np.ndarray, Num]
+BatchedGradFunc = Optional[Callable[['BatchedVariable'], None]]
+
+
+class BatchedVariable:
+    """`Variable` with an array value: one graph, many evaluation points.
+
+    Differentiating the same expression at N points costs N full graph
+    walks with scalar `Variable`s; here every node holds an
+    ``np.ndarray`` and each backward step is a single vectorized
+    accumulation, so the per-point Python overhead disappears.
+    """
+
+    __slots__ = (
+        'value', 'requires_grad', 'grad',
+        '_operation', '_left_node', '_right_node'
+    )
+
+    def __init__(
+        self,
+        value: Union[np.ndarray, Num],
+        operation: BatchedGradFunc = None,
+        left_node: Optional[BatchedVariable] = None,
+        right_node: Optional[BatchedVariable] = None,
+        requires_grad: bool = True
+    ):
+        if not isinstance(value, (np.ndarray, int, float)):
+            raise ValueError(
+                'Numeric data is expected (int, float, numpy.ndarray).'
+            )
+
+        self.value = np.asarray(value, dtype=np.float64)
+        self.requires_grad = requires_grad
+        self.grad = np.zeros_like(self.value) if requires_grad else None
+
+        self._operation = operation
+        self._left_node = left_node
+        self._right_node = right_node
+
+    def __str__(self) -> str:
+        return f'Value({self.value}, requires_grad={self.requires_grad})'
+
+    def _wrap(self, other: BatchedVar) -> BatchedVariable:
+        if isinstance(other, BatchedVariable):
+            return other
+        return BatchedVariable(other, requires_grad=False)
+
+    def __add__(self, other: BatchedVar) -> BatchedVariable:
+        other = self._wrap(other)
+        requires_grad = self.requires_grad or other.requires_grad
+        return BatchedVariable(
+            self.value + other.value,
+            BatchedVariable._add_backward if requires_grad else None,
+            self, other, requires_grad
+        )
+
+    def __radd__(self, other: BatchedVar) -> BatchedVariable:
+        return self + other
+
+    def __sub__(self, other: BatchedVar) -> BatchedVariable:
+        other = self._wrap(other)
+        requires_grad = self.requires_grad or other.requires_grad
+        return BatchedVariable(
+            self.value - other.value,
+            BatchedVariable._sub_backward if requires_grad else None,
+            self, other, requires_grad
+        )
+
+    def __rsub__(self, other: BatchedVar) -> BatchedVariable:
+        return self._wrap(other) - self
+
+    def __mul__(self, other: BatchedVar) -> BatchedVariable:
+        other = self._wrap(other)
+        requires_grad = self.requires_grad or other.requires_grad
+        return BatchedVariable(
+            self.value * other.value,
+            BatchedVariable._mul_backward if requires_grad else None,
+            self, other, requires_grad
+        )
+
+    def __rmul__(self, other: BatchedVar) -> BatchedVariable:
+        return self * other
+
+    def __pow__(self, other: BatchedVar) -> BatchedVariable:
+        other = self._wrap(other)
+        requires_grad = self.requires_grad or other.requires_grad
+        return BatchedVariable(
+            self.value ** other.value,
+            BatchedVariable._pow_backward if requires_grad else None,
+            self, other, requires_grad
+        )
+
+    def __rpow__(self, other: BatchedVar) -> BatchedVariable:
+        return self._wrap(other) ** self
+
+    def __truediv__(self, other: BatchedVar) -> BatchedVariable:
+        other = self._wrap(other)
+        requires_grad = self.requires_grad or other.requires_grad
+        return BatchedVariable(
+            self.value / other.value,
+            BatchedVariable._truediv_backward if requires_grad else None,
+            self, other, requires_grad
+        )
+
+    def __rtruediv__(self, other: BatchedVar) -> BatchedVariable:
+        return self._wrap(other) / self
+
+    def __neg__(self) -> BatchedVariable:
+        return BatchedVariable(
+            -self.value,
+            BatchedVariable._neg_backward if self.requires_grad else None,
+            self, None, self.requires_grad
+        )
+
+    def sin(self) -> BatchedVariable:
+        return BatchedVariable(
+            np.sin(self.value),
+            BatchedVariable._sin_backward if self.requires_grad else None,
+            self, None, self.requires_grad
+        )
+
+    def cos(self) -> BatchedVariable:
+        return BatchedVariable(
+            np.cos(self.value),
+            BatchedVariable._cos_backward if self.requires_grad else None,
+            self, None, self.requires_grad
+        )
+
+    def _accumulate(self, node: BatchedVariable, derivative) -> None:
+        contribution = derivative * self.grad
+        grad = node.grad
+        if grad.shape != contribution.shape:
+            # Undo broadcasting: reduce the prepended axes first, then
+            # sum (keeping dims) over the axes the leaf holds as size 1.
+            extra_axes = contribution.ndim - grad.ndim
+            if extra_axes > 0:
+                contribution = contribution.sum(axis=tuple(range(extra_axes)))
+            expanded = tuple(
+                axis for axis, size in enumerate(grad.shape)
+                if size == 1 and contribution.shape[axis] != 1
+            )
+            if expanded:
+                contribution = contribution.sum(axis=expanded, keepdims=True)
+        np.add(grad, contribution, out=grad)
+
+    def _general_grad_calc(self, left_derivative, right_derivative=0) -> None:
+        if self._left_node.requires_grad:
+            self._accumulate(self._left_node, left_derivative)
+        if self._right_node is not None and self._right_node.requires_grad:
+            self._accumulate(self._right_node, right_derivative)
+
+    def _add_backward(self) -> None:
+        self._general_grad_calc(1, 1)
+
+    def _sub_backward(self) -> None:
+        self._general_grad_calc(1, -1)
+
+    def _mul_backward(self) -> None:
+        self._general_grad_calc(
+            self._right_node.value,
+            self._left_node.value
+        )
+
+    def _pow_backward(self) -> None:
+        left_val = self._left_node.value
+        right_val = self._right_node.value
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            left_derivative = right_val * left_val ** (right_val - 1)
+            right_derivative = np.where(
+                left_val > 0, self.value * np.log(np.abs(left_val)), np.nan
+            )
+
+        self._general_grad_calc(left_derivative, right_derivative)
+
+    def _truediv_backward(self) -> None:
+        inverse = 1 / self._right_node.value
+        self._general_grad_calc(inverse, -self.value * inverse)
+
+    def _neg_backward(self) -> None:
+        self._general_grad_calc(-1)
+
+    def _sin_backward(self) -> None:
+        self._general_grad_calc(np.cos(self._left_node.value))
+
+    def _cos_backward(self) -> None:
+        self._general_grad_calc(-np.sin(self._left_node.value))
+
+    def _topological_order(self) -> list[BatchedVariable]:
+        order = []
+        seen = set()
+
+        stack = [(self, False)]
+        while stack:
+            curr_node, expanded = stack.pop()
+
+            if expanded:
+                order.append(curr_node)
+                continue
+
+            if id(curr_node) in seen:
+                continue
+            seen.add(id(curr_node))
+
+            stack.append((curr_node, True))
+            if curr_node._right_node is not None:
+                stack.append((curr_node._right_node, False))
+            if curr_node._left_node is not None:
+                stack.append((curr_node._left_node, False))
+
+        return order
+
+    def backward(self) -> None:
+        order = self._topological_order()
+
+        self.grad = np.ones_like(self.value)
+        for curr_node in reversed(order):
+            if curr_node.requires_grad and curr_node._operation:
+                curr_node._operation(curr_node)
+
+    def zero_grad(self):
+        if not self.requires_grad:
+            return
+
+        self.grad = np.zeros_like(self.value)
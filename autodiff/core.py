@@ -1,34 +1,39 @@
 from __future__ import annotations
 from typing import Optional, Union, Callable
+from array import array
 from math import log, sin, cos
 
+from ._ops import (
+    OP_LEAF, OP_ADD, OP_SUB, OP_MUL, OP_POW, OP_DIV, OP_SIN, OP_COS,
+    OP_NEG, OP_RDIV, OP_POW_CONST
+)
+
+try:
+    from ._core import backward_sweep as _backward_sweep
+except ImportError:
+    # backward_kernel is None when numpy/numba is missing too, which
+    # leaves the pure-Python per-node sweep in charge.
+    from ._nb_kernels import backward_kernel as _backward_sweep
+
 
 __all__ = ['Variable']
 
+# Aliases for default-argument binding inside the class body, where the
+# bare names sin/cos would resolve to the Variable methods instead.
+_log = log
+_sin = sin
+_cos = cos
+
 Num = Union[int, float]
 Var = Union['Variable', Num]
 GradFunc = Optional[Callable[['Variable'], None]]
 
 
-class VariableDescriptor:
-    def __set_name__(self, owner, name):
-        self.name = f'_{name}'
-
-    def __get__(self, instance, owner):
-        return getattr(instance, self.name)
-
-    def __set__(self, instance, value):
-        self._check_value(value)
-        setattr(instance, self.name, value)
-
-    @classmethod
-    def _check_value(cls, value):
-        if not isinstance(value, (int, float)):
-            raise ValueError('Numeric data is expected (int, float).')
-
-
 class Variable:
-    value = VariableDescriptor()
+    __slots__ = (
+        'value', 'requires_grad', '_grad', '_rg_mul', '_freed',
+        '_operation', '_left_node', '_right_node'
+    )
 
     def __init__(
         self,
@@ -38,9 +43,13 @@ class Variable:
         right_node: Optional[Variable] = None,
         requires_grad: bool = True
     ):
+        if not isinstance(value, (int, float)):
+            raise ValueError('Numeric data is expected (int, float).')
+
         self.value = value
         self.requires_grad = requires_grad
-        self.grad = 0 if self.requires_grad else None
+        self._grad = 0.0
+        self._rg_mul = 1.0 if requires_grad else 0.0
 
         self._operation = operation
         self._left_node = left_node
@@ -49,38 +58,125 @@ class Variable:
     def __str__(self) -> str:
         return f'Value({self.value}, requires_grad={self.requires_grad})'
 
+    @property
+    def grad(self) -> Optional[float]:
+        if not self.requires_grad:
+            return None
+        try:
+            return self._grad
+        except AttributeError:
+            return 0.0
+
+    @classmethod
+    def leaf(cls, value: Num, requires_grad: bool = True) -> Variable:
+        return cls(value, requires_grad=requires_grad)
+
+    @staticmethod
+    def _raw(
+            value: Num,
+            operation: GradFunc,
+            left_node: Optional[Variable],
+            right_node: Optional[Variable],
+            requires_grad: bool
+    ) -> Variable:
+        # Internal constructor for intermediate nodes: their values come
+        # out of arithmetic on already-validated operands, so the
+        # isinstance check in __init__ is pure overhead here.
+        # _grad is deliberately left unset: backward() zero-fills every
+        # non-leaf node it visits in one pass, which is cheaper than a
+        # write on every allocation.
+        node = Variable.__new__(Variable)
+        node.value = value
+        node.requires_grad = requires_grad
+        node._rg_mul = 1.0 if requires_grad else 0.0
+        node._operation = operation
+        node._left_node = left_node
+        node._right_node = right_node
+        return node
+
     def __add__(self, other: Var) -> Variable:
-        return self._binary_general_calc(other, lambda a, b: a + b, Variable._add_backward)
+        if not isinstance(other, Variable):
+            other = _wrap_constant(other)
+        requires_grad = self.requires_grad or other.requires_grad
+        return Variable._raw(
+            self.value + other.value,
+            Variable._add_backward if requires_grad else None,
+            self, other, requires_grad
+        )
 
     def __radd__(self, other: Num) -> Variable:
         return self + other
 
     def __sub__(self, other: Var) -> Variable:
-        return self._binary_general_calc(other, lambda a, b: a - b, Variable._sub_backward)
+        if not isinstance(other, Variable):
+            other = _wrap_constant(other)
+        requires_grad = self.requires_grad or other.requires_grad
+        return Variable._raw(
+            self.value - other.value,
+            Variable._sub_backward if requires_grad else None,
+            self, other, requires_grad
+        )
 
     def __rsub__(self, other: Num) -> Variable:
-        return -self + other
+        return Variable._raw(
+            other - self.value,
+            Variable._neg_backward if self.requires_grad else None,
+            self, None, self.requires_grad
+        )
 
     def __mul__(self, other: Var) -> Variable:
-        return self._binary_general_calc(other, lambda a, b: a * b, Variable._mul_backward)
+        if not isinstance(other, Variable):
+            other = _wrap_constant(other)
+        requires_grad = self.requires_grad or other.requires_grad
+        return Variable._raw(
+            self.value * other.value,
+            Variable._mul_backward if requires_grad else None,
+            self, other, requires_grad
+        )
 
     def __rmul__(self, other: Num) -> Variable:
         return self * other
 
     def __pow__(self, other: Var) -> Variable:
-        return self._binary_general_calc(other, lambda a, b: a ** b, Variable._pow_backward)
+        if not isinstance(other, Variable):
+            other = _wrap_constant(other)
+        requires_grad = self.requires_grad or other.requires_grad
+        if not requires_grad:
+            operation = None
+        elif other.requires_grad:
+            operation = Variable._pow_backward
+        else:
+            operation = Variable._pow_const_backward
+        return Variable._raw(
+            self.value ** other.value, operation, self, other, requires_grad
+        )
 
     def __rpow__(self, other: Num) -> Variable:
-        return Variable(other, requires_grad=False) ** self
+        return _wrap_constant(other) ** self
 
     def __truediv__(self, other: Var) -> Variable:
-        return self._binary_general_calc(other, lambda a, b: a / b, Variable._truediv_backward)
+        if not isinstance(other, Variable):
+            other = _wrap_constant(other)
+        requires_grad = self.requires_grad or other.requires_grad
+        return Variable._raw(
+            self.value / other.value,
+            Variable._truediv_backward if requires_grad else None,
+            self, other, requires_grad
+        )
 
     def __rtruediv__(self, other: Num) -> Variable:
-        return self ** -1 * other
+        return Variable._raw(
+            other / self.value,
+            Variable._rdiv_backward if self.requires_grad else None,
+            self, None, self.requires_grad
+        )
 
     def __neg__(self) -> Variable:
-        return self * -1
+        return Variable._raw(
+            -self.value,
+            Variable._neg_backward if self.requires_grad else None,
+            self, None, self.requires_grad
+        )
 
     def sin(self) -> Variable:
         return self._unary_general_calc(sin, Variable._sin_backward)
@@ -88,52 +184,38 @@ class Variable:
     def cos(self) -> Variable:
         return self._unary_general_calc(cos, Variable._cos_backward)
 
-    def _binary_general_calc(
-            self,
-            second_node: Var,
-            operation: Callable[[Num, Num], Num],
-            backward_operation: GradFunc
-    ) -> Variable:
-        if not isinstance(second_node, Variable):
-            second_node = Variable(second_node)
-
-        requires_grad = self.requires_grad | second_node.requires_grad
-        return Variable(
-            operation(self.value, second_node.value),
-            operation=backward_operation if requires_grad else None,
-            left_node=self,
-            right_node=second_node,
-            requires_grad=requires_grad
-        )
-
     def _unary_general_calc(
         self,
         operation: Callable[[Num], Num],
         backward_operation: GradFunc
     ) -> Variable:
-        return Variable(
+        return Variable._raw(
             operation(self.value),
-            operation=backward_operation if self.requires_grad else None,
-            left_node=self,
-            right_node=None,
-            requires_grad=self.requires_grad
+            backward_operation if self.requires_grad else None,
+            self, None, self.requires_grad
         )
 
     def _general_grad_calc(
             self,
             left_derivative: Num,
-            right_derivative: Num = 0
+            right_derivative: Num = 0.0
     ) -> None:
-        if self._left_node.requires_grad:
-            self._left_node.grad += left_derivative * self.grad
-        if self._right_node and self._right_node.requires_grad:
-            self._right_node.grad += right_derivative * self.grad
+        # _rg_mul is 0.0 on nodes that do not track gradients, so the
+        # binary case needs no branches at all - the accumulation is a
+        # pair of unconditional fused multiply-adds.
+        left_node = self._left_node
+        left_node._grad += left_node._rg_mul * left_derivative * self._grad
+
+        right_node = self._right_node
+        if right_node is not None:
+            right_node._grad += \
+                right_node._rg_mul * right_derivative * self._grad
 
     def _add_backward(self) -> None:
-        self._general_grad_calc(1, 1)
+        self._general_grad_calc(1.0, 1.0)
 
     def _sub_backward(self) -> None:
-        self._general_grad_calc(1, -1)
+        self._general_grad_calc(1.0, -1.0)
 
     def _mul_backward(self) -> None:
         self._general_grad_calc(
@@ -141,40 +223,331 @@ class Variable:
             self._left_node.value
         )
 
-    def _pow_backward(self) -> None:
+    def _pow_backward(self, _log=_log) -> None:
+        # Default-argument binding turns the module-global lookup of
+        # log (and sin/cos below) into a LOAD_FAST in these hot
+        # methods.
         left_val = self._left_node.value
         right_val = self._right_node.value
 
+        # self.value already holds left_val ** right_val from the forward
+        # pass, so both partials come out of one division instead of two
+        # extra pow calls.
+        if left_val != 0:
+            left_derivative = right_val * self.value / left_val
+        else:
+            left_derivative = right_val * left_val ** (right_val - 1)
+
         self._general_grad_calc(
-            right_val * left_val ** (right_val - 1),
-            left_val ** right_val * log(left_val) if left_val > 0 else float('nan')
+            left_derivative,
+            self.value * _log(left_val) if left_val > 0 else float('nan')
         )
 
-    def _truediv_backward(self) -> None:
-        self._general_grad_calc(1 / self._right_node.value,
-                                -self._left_node.value / self._right_node.value ** 2)
-
-    def _sin_backward(self) -> None:
-        self._general_grad_calc(cos(self._left_node.value))
+    def _neg_backward(self) -> None:
+        self._general_grad_calc(-1.0)
 
-    def _cos_backward(self) -> None:
-        self._general_grad_calc(-sin(self._left_node.value))
+    def _rdiv_backward(self) -> None:
+        # d(c / x) / dx == -c / x**2 == -(c / x) / x, and c / x is
+        # already stored on the node as the forward value.
+        self._general_grad_calc(-self.value / self._left_node.value)
 
-    def backward(self) -> None:
-        self.grad = 1
+    def _pow_const_backward(self) -> None:
+        # Exponent is a constant: its gradient is never propagated, so
+        # the log term of _pow_backward can be skipped entirely, and
+        # small integer exponents avoid pow altogether.
+        left_val = self._left_node.value
+        right_val = self._right_node.value
 
-        stack = [self]
-        while stack:
-            curr_node = stack.pop()
+        if right_val == 2:
+            left_derivative = 2 * left_val
+        elif right_val == 3:
+            left_derivative = 3 * left_val * left_val
+        elif left_val != 0:
+            left_derivative = right_val * self.value / left_val
+        else:
+            left_derivative = right_val * left_val ** (right_val - 1)
 
-            if curr_node and curr_node.requires_grad and curr_node._operation:
-                stack.append(curr_node._left_node)
-                stack.append(curr_node._right_node)
+        self._general_grad_calc(left_derivative)
 
-                curr_node._operation(curr_node)
+    def _truediv_backward(self) -> None:
+        inverse = 1 / self._right_node.value
+        self._general_grad_calc(inverse, -self.value * inverse)
+
+    def _sin_backward(self, _cos=_cos) -> None:
+        # The node's own value is sin(left) from the forward pass, so a
+        # cache hit - or seeding one - never costs more than the one
+        # missing half of the (sin, cos) pair.
+        left_node = self._left_node
+        pair = _TRIG_CACHE.get(id(left_node))
+        if pair is None:
+            pair = (self.value, _cos(left_node.value))
+            _TRIG_CACHE[id(left_node)] = pair
+        self._general_grad_calc(pair[1])
+
+    def _cos_backward(self, _sin=_sin) -> None:
+        left_node = self._left_node
+        pair = _TRIG_CACHE.get(id(left_node))
+        if pair is None:
+            pair = (_sin(left_node.value), self.value)
+            _TRIG_CACHE[id(left_node)] = pair
+        self._general_grad_calc(-pair[0])
+
+    def _topological_order(self) -> list[Variable]:
+        order = []
+        seen = set()
+
+        stack = [(self, False)]
+        while stack:
+            curr_node, expanded = stack.pop()
+
+            if expanded:
+                order.append(curr_node)
+                continue
+
+            if id(curr_node) in seen:
+                continue
+            seen.add(id(curr_node))
+
+            stack.append((curr_node, True))
+            if curr_node._right_node is not None:
+                stack.append((curr_node._right_node, False))
+            if curr_node._left_node is not None:
+                stack.append((curr_node._left_node, False))
+
+        return order
+
+    @staticmethod
+    def _eliminate_common_subexpressions(order: list[Variable]):
+        # Children come before parents in topological order, so one
+        # forward walk can both retarget parents at already-replaced
+        # children and detect duplicates by (operation, left, right).
+        canonical = {}
+        replaced = {}
+        duplicates = []
+        new_order = []
+
+        for node in order:
+            operation = node._operation
+            if operation is None:
+                new_order.append(node)
+                continue
+
+            left_node = node._left_node
+            replacement = replaced.get(id(left_node))
+            if replacement is not None:
+                node._left_node = left_node = replacement
+
+            right_node = node._right_node
+            if right_node is not None:
+                replacement = replaced.get(id(right_node))
+                if replacement is not None:
+                    node._right_node = right_node = replacement
+
+            key = (
+                operation,
+                id(left_node),
+                id(right_node) if right_node is not None else None
+            )
+            canon = canonical.get(key)
+            if canon is None:
+                canonical[key] = node
+                new_order.append(node)
+            else:
+                replaced[id(node)] = canon
+                duplicates.append((node, canon))
+
+        return new_order, duplicates
+
+    def _serialize(self, order: list[Variable]):
+        count = len(order)
+        opcodes = array('b', bytes(count))
+        lefts = array('i', bytes(4 * count))
+        rights = array('i', bytes(4 * count))
+        values = array('d', bytes(8 * count))
+
+        index_of = {}
+        for index, node in enumerate(order):
+            index_of[id(node)] = index
+
+        for index, node in enumerate(order):
+            values[index] = node.value
+            operation = node._operation
+            if operation is None or not node.requires_grad:
+                opcodes[index] = OP_LEAF
+                continue
+
+            opcodes[index] = _BACKWARD_OPCODES[operation]
+            lefts[index] = index_of[id(node._left_node)]
+            rights[index] = (index_of[id(node._right_node)]
+                             if node._right_node is not None else -1)
+
+        return opcodes, lefts, rights, values
+
+    def _array_backward(self, order: list[Variable]) -> None:
+        opcodes, lefts, rights, values = self._serialize(order)
+
+        grads = array('d', bytes(8 * len(order)))
+        grads[-1] = 1.0
+        if _backward_sweep is not None:
+            _backward_sweep(opcodes, lefts, rights, values, grads)
+        else:
+            _python_backward_sweep(opcodes, lefts, rights, values, grads)
+
+        for index, node in enumerate(order):
+            if not node.requires_grad:
+                node._grad = 0.0
+            elif node._operation is not None:
+                node._grad = grads[index]
+            else:
+                node._grad += grads[index]
+        self._grad = grads[-1]
+
+    def backward(self, retain_graph: bool = False, cse: bool = False) -> None:
+        if getattr(self, '_freed', False):
+            raise RuntimeError(
+                'The graph has already been freed by a previous backward '
+                'call; use backward(retain_graph=True) to backward through '
+                'it more than once.'
+            )
+
+        order = self._topological_order()
+
+        duplicates = None
+        if cse:
+            order, duplicates = self._eliminate_common_subexpressions(order)
+
+        if _backward_sweep is not None:
+            self._array_backward(order)
+        else:
+            # Gradient slots of leaves survive between calls
+            # (accumulation semantics); everything else starts from
+            # zero here.
+            for curr_node in order:
+                if curr_node._operation is not None \
+                        or not curr_node.requires_grad:
+                    curr_node._grad = 0.0
+
+            _TRIG_CACHE.clear()
+            self._grad = 1.0
+            for curr_node in reversed(order):
+                if curr_node.requires_grad and curr_node._operation:
+                    curr_node._operation(curr_node)
+
+        if duplicates:
+            for duplicate, canon in duplicates:
+                duplicate._grad = canon._grad
+
+        if not retain_graph:
+            # Drop child links so the forward graph is reclaimable even
+            # while the caller still holds the root; pass
+            # retain_graph=True to backward through it again. Duplicates
+            # dropped by CSE still hold (retargeted) child links, so
+            # they get the same treatment.
+            if duplicates:
+                order = order + [duplicate for duplicate, _ in duplicates]
+            for curr_node in order:
+                if curr_node._left_node is not None:
+                    curr_node._left_node = None
+                    curr_node._right_node = None
+                    curr_node._operation = None
+                    curr_node._freed = True
 
     def zero_grad(self):
-        if not self.requires_grad:
-            return
-
-        self.grad = 0
+        self._grad = 0.0
+
+
+# (sin, cos) pairs keyed by operand node id; valid for the duration of
+# one backward sweep, cleared at the start of the next.
+_TRIG_CACHE: dict = {}
+
+_BACKWARD_OPCODES = {
+    Variable._add_backward: OP_ADD,
+    Variable._sub_backward: OP_SUB,
+    Variable._mul_backward: OP_MUL,
+    Variable._pow_backward: OP_POW,
+    Variable._truediv_backward: OP_DIV,
+    Variable._sin_backward: OP_SIN,
+    Variable._cos_backward: OP_COS,
+    Variable._neg_backward: OP_NEG,
+    Variable._rdiv_backward: OP_RDIV,
+    Variable._pow_const_backward: OP_POW_CONST,
+}
+
+def _python_backward_sweep(opcodes, lefts, rights, values, grads,
+                           _log=_log, _sin=_sin, _cos=_cos) -> None:
+    # Same sweep as the compiled kernels, over the flat arrays from
+    # _serialize. Kept as the total fallback of _array_backward; as the
+    # default no-kernel path it measured slower than the per-node sweep
+    # at every graph size tried, because serialization costs a full
+    # extra pass.
+    trig = {}
+    for k in range(len(opcodes) - 1, -1, -1):
+        op = opcodes[k]
+        if op < 0:
+            continue
+
+        grad = grads[k]
+        left = lefts[k]
+        right = rights[k]
+
+        if op == OP_ADD:
+            grads[left] += grad
+            grads[right] += grad
+        elif op == OP_MUL:
+            grads[left] += values[right] * grad
+            grads[right] += values[left] * grad
+        elif op == OP_SUB:
+            grads[left] += grad
+            grads[right] -= grad
+        elif op == OP_POW_CONST:
+            left_val = values[left]
+            right_val = values[right]
+            if right_val == 2:
+                grads[left] += 2.0 * left_val * grad
+            elif left_val != 0:
+                grads[left] += right_val * values[k] / left_val * grad
+            else:
+                grads[left] += \
+                    right_val * left_val ** (right_val - 1) * grad
+        elif op == OP_DIV:
+            right_val = values[right]
+            grads[left] += grad / right_val
+            grads[right] -= values[k] / right_val * grad
+        elif op == OP_POW:
+            left_val = values[left]
+            right_val = values[right]
+            if left_val != 0:
+                grads[left] += right_val * values[k] / left_val * grad
+            else:
+                grads[left] += \
+                    right_val * left_val ** (right_val - 1) * grad
+            grads[right] += (values[k] * _log(left_val)
+                             if left_val > 0 else float('nan')) * grad
+        elif op == OP_SIN:
+            pair = trig.get(left)
+            if pair is None:
+                pair = (values[k], _cos(values[left]))
+                trig[left] = pair
+            grads[left] += pair[1] * grad
+        elif op == OP_COS:
+            pair = trig.get(left)
+            if pair is None:
+                pair = (_sin(values[left]), values[k])
+                trig[left] = pair
+            grads[left] -= pair[0] * grad
+        elif op == OP_NEG:
+            grads[left] -= grad
+        elif op == OP_RDIV:
+            grads[left] -= values[k] / values[left] * grad
+
+
+_CONST_CACHE = {value: Variable(value, requires_grad=False)
+                for value in range(-2, 17)}
+
+
+def _wrap_constant(value: Num) -> Variable:
+    if type(value) is int:
+        cached = _CONST_CACHE.get(value)
+        if cached is not None:
+            return cached
+    return Variable(value, requires_grad=False)
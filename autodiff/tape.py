@@ -0,0 +1,256 @@
+from __future__ import annotations
+from typing import List, Optional, Union
+from math import log, sin, cos
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+from ._ops import (
+    OP_LEAF, OP_ADD, OP_SUB, OP_MUL, OP_POW, OP_DIV, OP_SIN, OP_COS
+)
+
+__all__ = ['Tape', 'TapeVariable']
+
+Num = Union[int, float]
+TapeVar = Union['TapeVariable', Num]
+
+
+def _forward_loop(opcodes, lefts, rights, values) -> None:
+    for k in range(len(opcodes)):
+        op = opcodes[k]
+        if op < 0:
+            continue
+
+        left = lefts[k]
+        right = rights[k]
+
+        if op == OP_ADD:
+            values[k] = values[left] + values[right]
+        elif op == OP_SUB:
+            values[k] = values[left] - values[right]
+        elif op == OP_MUL:
+            values[k] = values[left] * values[right]
+        elif op == OP_POW:
+            values[k] = values[left] ** values[right]
+        elif op == OP_DIV:
+            values[k] = values[left] / values[right]
+        elif op == OP_SIN:
+            values[k] = sin(values[left])
+        elif op == OP_COS:
+            values[k] = cos(values[left])
+
+
+def _backward_loop(opcodes, lefts, rights, values, grads) -> None:
+    for k in range(len(opcodes) - 1, -1, -1):
+        op = opcodes[k]
+        if op < 0:
+            continue
+
+        grad = grads[k]
+        left = lefts[k]
+        right = rights[k]
+
+        if op == OP_ADD:
+            grads[left] += grad
+            grads[right] += grad
+        elif op == OP_SUB:
+            grads[left] += grad
+            grads[right] -= grad
+        elif op == OP_MUL:
+            grads[left] += values[right] * grad
+            grads[right] += values[left] * grad
+        elif op == OP_POW:
+            left_val = values[left]
+            right_val = values[right]
+            grads[left] += right_val * left_val ** (right_val - 1) * grad
+            grads[right] += (values[k] * log(left_val) if left_val > 0
+                             else float('nan')) * grad
+        elif op == OP_DIV:
+            right_val = values[right]
+            grads[left] += grad / right_val
+            grads[right] -= values[left] / right_val ** 2 * grad
+        elif op == OP_SIN:
+            grads[left] += cos(values[left]) * grad
+        elif op == OP_COS:
+            grads[left] -= sin(values[left]) * grad
+
+
+if njit is not None and np is not None:
+    _forward_compiled = njit(cache=True)(_forward_loop)
+    _backward_compiled = njit(cache=True)(_backward_loop)
+else:
+    _forward_compiled = None
+    _backward_compiled = None
+
+
+class Tape:
+    """Linear record of operations stored in parallel arrays.
+
+    A drop-in fast path for large expressions: instead of one
+    ``Variable`` object per operation, every node is a row of
+    (opcode, left index, right index, value), and ``backward`` is a
+    single loop over those rows (compiled with numba when available).
+    """
+
+    def __init__(self):
+        self._opcodes: List[int] = []
+        self._lefts: List[int] = []
+        self._rights: List[int] = []
+        self._values: List[float] = []
+        self._requires_grad: List[bool] = []
+        self.grads = None
+
+    def __len__(self) -> int:
+        return len(self._opcodes)
+
+    def variable(self, value: Num, requires_grad: bool = True) -> TapeVariable:
+        if not isinstance(value, (int, float)):
+            raise ValueError('Numeric data is expected (int, float).')
+
+        index = self._append(OP_LEAF, -1, -1, value, requires_grad)
+        return TapeVariable(self, index)
+
+    def _append(
+            self,
+            opcode: int,
+            left: int,
+            right: int,
+            value: float,
+            requires_grad: bool
+    ) -> int:
+        self._opcodes.append(opcode)
+        self._lefts.append(left)
+        self._rights.append(right)
+        self._values.append(value)
+        self._requires_grad.append(requires_grad)
+        self.grads = None
+        return len(self._opcodes) - 1
+
+    def backward(self, index: int) -> None:
+        if np is not None:
+            opcodes = np.asarray(self._opcodes, dtype=np.int8)
+            lefts = np.asarray(self._lefts, dtype=np.int32)
+            rights = np.asarray(self._rights, dtype=np.int32)
+            values = np.asarray(self._values, dtype=np.float64)
+            grads = np.zeros(len(self._opcodes), dtype=np.float64)
+        else:
+            opcodes, lefts, rights = self._opcodes, self._lefts, self._rights
+            values = self._values
+            grads = [0.0] * len(self._opcodes)
+
+        grads[index] = 1.0
+
+        if _backward_compiled is not None:
+            _backward_compiled(opcodes, lefts, rights, values, grads)
+        else:
+            _backward_loop(opcodes, lefts, rights, values, grads)
+
+        self.grads = grads
+
+    def zero_grad(self) -> None:
+        self.grads = None
+
+
+class TapeVariable:
+    """Thin handle onto a `Tape` row; mirrors the `Variable` interface."""
+
+    __slots__ = ('_tape', '_index')
+
+    def __init__(self, tape: Tape, index: int):
+        self._tape = tape
+        self._index = index
+
+    @property
+    def value(self) -> float:
+        return self._tape._values[self._index]
+
+    @property
+    def requires_grad(self) -> bool:
+        return self._tape._requires_grad[self._index]
+
+    @property
+    def grad(self) -> Optional[float]:
+        if not self.requires_grad:
+            return None
+        if self._tape.grads is None:
+            return 0
+        return self._tape.grads[self._index]
+
+    def __str__(self) -> str:
+        return f'Value({self.value}, requires_grad={self.requires_grad})'
+
+    def _wrap(self, other: TapeVar) -> TapeVariable:
+        if isinstance(other, TapeVariable):
+            return other
+        return self._tape.variable(other, requires_grad=False)
+
+    def _binary(self, other: TapeVar, opcode: int, value: float) -> TapeVariable:
+        requires_grad = self.requires_grad or other.requires_grad
+        index = self._tape._append(
+            opcode, self._index, other._index, value, requires_grad
+        )
+        return TapeVariable(self._tape, index)
+
+    def _unary(self, opcode: int, value: float) -> TapeVariable:
+        index = self._tape._append(
+            opcode, self._index, -1, value, self.requires_grad
+        )
+        return TapeVariable(self._tape, index)
+
+    def __add__(self, other: TapeVar) -> TapeVariable:
+        other = self._wrap(other)
+        return self._binary(other, OP_ADD, self.value + other.value)
+
+    def __radd__(self, other: Num) -> TapeVariable:
+        return self + other
+
+    def __sub__(self, other: TapeVar) -> TapeVariable:
+        other = self._wrap(other)
+        return self._binary(other, OP_SUB, self.value - other.value)
+
+    def __rsub__(self, other: Num) -> TapeVariable:
+        return self._wrap(other) - self
+
+    def __mul__(self, other: TapeVar) -> TapeVariable:
+        other = self._wrap(other)
+        return self._binary(other, OP_MUL, self.value * other.value)
+
+    def __rmul__(self, other: Num) -> TapeVariable:
+        return self * other
+
+    def __pow__(self, other: TapeVar) -> TapeVariable:
+        other = self._wrap(other)
+        return self._binary(other, OP_POW, self.value ** other.value)
+
+    def __rpow__(self, other: Num) -> TapeVariable:
+        return self._wrap(other) ** self
+
+    def __truediv__(self, other: TapeVar) -> TapeVariable:
+        other = self._wrap(other)
+        return self._binary(other, OP_DIV, self.value / other.value)
+
+    def __rtruediv__(self, other: Num) -> TapeVariable:
+        return self._wrap(other) / self
+
+    def __neg__(self) -> TapeVariable:
+        return self * -1
+
+    def sin(self) -> TapeVariable:
+        return self._unary(OP_SIN, sin(self.value))
+
+    def cos(self) -> TapeVariable:
+        return self._unary(OP_COS, cos(self.value))
+
+    def backward(self) -> None:
+        self._tape.backward(self._index)
+
+    def zero_grad(self) -> None:
+        self._tape.zero_grad()
@@ -0,0 +1,62 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from autodiff import BatchedVariable # noqa: E402
+
+
+def test_batched_add_mul():
+    x = BatchedVariable(np.array([1.0, 2.0, 3.0]))
+    y = BatchedVariable(np.array([4.0, 5.0, 6.0]))
+    f = x * y + x
+    f.backward()
+    assert np.array_equal(f.value, np.array([5.0, 12.0, 21.0]))
+    assert np.array_equal(x.grad, y.value + 1)
+    assert np.array_equal(y.grad, x.value)
+
+
+def test_batched_pow_div():
+    x = BatchedVariable(np.array([2.0, 3.0]))
+    y = BatchedVariable(np.array([4.0, 5.0]))
+    f = x ** 2 - 1 / y
+    f.backward()
+    assert np.array_equal(x.grad, 2 * x.value)
+    assert np.allclose(y.grad, 1 / y.value ** 2)
+
+
+def test_batched_sin_cos():
+    x = BatchedVariable(np.linspace(0, 1, 5))
+    f = x.sin() * x.cos()
+    f.backward()
+    assert np.allclose(f.value, np.sin(x.value) * np.cos(x.value))
+    assert np.allclose(x.grad, np.cos(x.value) ** 2 - np.sin(x.value) ** 2)
+
+
+def test_batched_scalar_leaf():
+    x = BatchedVariable(np.array([1.0, 2.0, 3.0]))
+    a = BatchedVariable(2.0)
+    f = a * x
+    f.backward()
+    assert a.grad == pytest.approx(x.value.sum())
+    assert np.array_equal(x.grad, np.full(3, 2.0))
+
+
+def test_batched_broadcast_leaf():
+    x = BatchedVariable(np.ones((3, 1)))
+    y = BatchedVariable(2 * np.ones((3, 4)))
+    f = x * y
+    f.backward()
+    assert np.array_equal(x.grad, np.full((3, 1), 8.0))
+    assert np.array_equal(y.grad, np.ones((3, 4)))
+
+
+def test_batched_grad_false():
+    x = BatchedVariable(np.array([1.0, 2.0]), requires_grad=False)
+    f = x + 2
+    f.backward()
+    assert x.grad is None
+
+
+def test_batched_non_num():
+    with pytest.raises(ValueError):
+        BatchedVariable('a')
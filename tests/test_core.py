@@ -2,6 +2,29 @@ import pytest
 
 from math import cos, sin, log, isnan
 from autodiff import Variable
+from autodiff import core
+
+
+def test_python_sweep_sin_cos(monkeypatch):
+    # The per-node Python sweep must stay correct even when a compiled
+    # kernel is installed and normally takes over.
+    monkeypatch.setattr(core, '_backward_sweep', None)
+    x = Variable(10)
+    f = x.sin() * x.cos()
+    f.backward()
+    assert x.grad == cos(10) * cos(10) - sin(10) * sin(10)
+
+
+def test_python_array_sweep(monkeypatch):
+    # Exercise the structure-of-arrays sweep with its pure-Python loop,
+    # as used when a compiled kernel import breaks mid-flight.
+    monkeypatch.setattr(core, '_backward_sweep', None)
+    x = Variable(2)
+    y = Variable(3)
+    f = x * y + x ** 2 - 1 / y + x.sin() * x.cos()
+    f._array_backward(f._topological_order())
+    assert x.grad == 7 + (cos(2) * cos(2) - sin(2) * sin(2))
+    assert y.grad == 2 + 1 / 9
 
 
 def test_zero_grad():
@@ -92,6 +115,14 @@ def test_pow_rpow():
     assert f3.value == 8
 
 
+def test_pow_int_const():
+    x = Variable(4)
+    f = x ** 3
+    f.backward()
+    assert x.grad == 3 * x.value ** 2
+    assert f.value == 64
+
+
 def test_nan_pow():
     x = Variable(2)
     f = (-2) ** x
@@ -162,6 +193,61 @@ def test_example1():
     assert x.grad == 7 and y.grad == (2 + 1 / 9)
 
 
+def test_shared_subexpression():
+    x = Variable(2)
+    y = Variable(3)
+    t = x * y
+    f = t + t
+    f.backward()
+    assert x.grad == 2 * y.value and y.grad == 2 * x.value
+
+
+def test_backward_frees_graph():
+    x = Variable(2)
+    f = x * 3 + 1
+    f.backward()
+    assert x.grad == 3
+    assert f._left_node is None and f._operation is None
+
+
+def test_double_backward_raises():
+    x = Variable(2)
+    f = x * 3
+    f.backward()
+    with pytest.raises(RuntimeError):
+        f.backward()
+    assert x.grad == 3
+
+
+def test_retain_graph():
+    x = Variable(2)
+    f = x * 3
+    f.backward(retain_graph=True)
+    f.backward(retain_graph=True)
+    assert x.grad == 6
+    assert f._left_node is x
+
+
+def test_cse_backward():
+    x = Variable(2)
+    y = Variable(3)
+    f = x * y + x * y + x ** 2
+    f.backward(cse=True)
+    assert x.grad == 2 * y.value + 2 * x.value
+    assert y.grad == 2 * x.value
+
+
+def test_cse_backward_frees_duplicates():
+    x = Variable(2)
+    y = Variable(3)
+    first = x * y
+    second = x * y
+    f = first + second
+    f.backward(cse=True)
+    assert first._left_node is None and first._operation is None
+    assert second._left_node is None and second._operation is None
+
+
 def test_two_example2():
     x = Variable(10)
     y = Variable(3, requires_grad=False)
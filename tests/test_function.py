@@ -0,0 +1,32 @@
+import pytest
+
+from math import sin, cos
+from autodiff import Function
+
+
+def test_function_records_and_replays():
+    f = Function(lambda x, y: x * y + x ** 2 - 1 / y)
+
+    value, (dx, dy) = f(2, 3)
+    assert value == pytest.approx(2 * 3 + 4 - 1 / 3)
+    assert dx == pytest.approx(7) and dy == pytest.approx(2 + 1 / 9)
+
+    value, (dx, dy) = f(1, 1)
+    assert value == pytest.approx(1)
+    assert dx == pytest.approx(3) and dy == pytest.approx(2)
+
+
+def test_function_trig():
+    f = Function(lambda x: x.sin() * x.cos())
+
+    for point in (0.0, 0.5, 2.0):
+        value, (dx,) = f(point)
+        assert value == pytest.approx(sin(point) * cos(point))
+        assert dx == pytest.approx(cos(point) ** 2 - sin(point) ** 2)
+
+
+def test_function_wrong_arity():
+    f = Function(lambda x, y: x + y)
+    f(1, 2)
+    with pytest.raises(ValueError):
+        f(1)
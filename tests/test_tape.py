@@ -0,0 +1,69 @@
+import pytest
+
+from math import cos, sin, log
+from autodiff import Tape
+
+
+def test_tape_add():
+    tape = Tape()
+    x = tape.variable(2)
+    y = tape.variable(3)
+    f = x + y + 2
+    f.backward()
+    assert x.grad == 1 and y.grad == 1
+    assert f.value == 7
+
+
+def test_tape_reused_variable():
+    tape = Tape()
+    x = tape.variable(2)
+    y = tape.variable(3)
+    f = x * y + x ** 2 - 1 / y
+    f.backward()
+    assert x.grad == 7 and y.grad == (2 + 1 / 9)
+
+
+def test_tape_pow_rpow():
+    tape = Tape()
+    x = tape.variable(2)
+    y = tape.variable(3)
+    f1 = x ** 2
+    f2 = 2 ** y
+    f1.backward()
+    assert x.grad == 2 * x.value
+    f2.backward()
+    assert y.grad == 2 ** y.value * log(2)
+
+
+def test_tape_sin_cos():
+    tape = Tape()
+    x = tape.variable(10)
+    f = x.sin() * x.cos()
+    f.backward()
+    assert f.value == sin(10) * cos(10)
+    assert x.grad == pytest.approx(cos(10) ** 2 - sin(10) ** 2)
+
+
+def test_tape_grad_false():
+    tape = Tape()
+    x = tape.variable(5, requires_grad=False)
+    f = x + 2
+    f.backward()
+    assert x.grad is None
+
+
+def test_tape_non_num():
+    tape = Tape()
+    with pytest.raises(ValueError):
+        tape.variable('a')
+
+
+def test_tape_zero_grad():
+    tape = Tape()
+    x = tape.variable(10)
+    f = x * 10
+    f.backward()
+    assert x.grad == 10
+
+    x.zero_grad()
+    assert x.grad == 0